@@ -1,14 +1,25 @@
 import asyncio
-import requests
-from bs4 import BeautifulSoup
+import httpx
+import io
+import orjson
+from bs4 import BeautifulSoup, SoupStrainer, UnicodeDammit
+from bs4.dammit import EncodingDetector
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
 import os
 from pathlib import Path
 import time
 import threading
+import weakref
 import logging
 from urllib.parse import urlparse
+import bisect
+import codecs
 import ipaddress
-from typing import List
+import re
+import socket
+import sys
+from typing import List, Dict, Any, AsyncIterator, NamedTuple
 
 from mcp.server.fastmcp import FastMCP
 
@@ -24,20 +35,16 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Initialize FastMCP server
-mcp = FastMCP("url-text-fetcher")
+# KEY=value assignments in a .env file; comment and blank lines never match
+ENV_LINE_PATTERN = re.compile(r'^[ \t]*([A-Za-z_][A-Za-z0-9_]*)[ \t]*=[ \t]*(.*?)[ \t\r]*$', re.MULTILINE)
 
 # Load environment variables from .env file if it exists
 def load_env():
     env_path = Path(__file__).parent.parent.parent / '.env'
     if env_path.exists():
-        with open(env_path) as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#') and '=' in line:
-                    key, value = line.split('=', 1)
-                    if value and key not in os.environ:
-                        os.environ[key] = value
+        pairs = ENV_LINE_PATTERN.findall(env_path.read_text())
+        # Reverse so the first assignment of a key in the file wins
+        os.environ.update({key: value for key, value in reversed(pairs) if value and key not in os.environ})
 
 load_env()
 
@@ -49,44 +56,255 @@ def get_int_env(key: str, default: int) -> int:
         logger.warning(f"Invalid {key} value, using default: {default}")
         return default
 
-# Environment configuration
-BRAVE_API_KEY = os.getenv('BRAVE_API_KEY', '')
-BRAVE_RATE_LIMIT_RPS = get_int_env('BRAVE_RATE_LIMIT_RPS', 1)  # Default to free tier
-REQUEST_TIMEOUT = get_int_env('REQUEST_TIMEOUT', 10)
-CONTENT_LENGTH_LIMIT = get_int_env('CONTENT_LENGTH_LIMIT', 5000)
-MAX_RESPONSE_SIZE = get_int_env('MAX_RESPONSE_SIZE', 10485760)  # 10MB default
+@dataclass(frozen=True, slots=True)
+class Config:
+    """Server configuration, read from the environment once at import time."""
+    brave_api_key: str = ''
+    brave_rate_limit_rps: int = 1
+    request_timeout: int = 10
+    content_length_limit: int = 5000
+    max_response_size: int = 10485760
+    max_concurrent_fetches: int = 10
+    url_cache_ttl_seconds: int = 3600
+    cache_brave_ttl: int = 300
 
-# Validate rate limit configuration
-if BRAVE_RATE_LIMIT_RPS < 1:
-    logger.warning(f"Invalid BRAVE_RATE_LIMIT_RPS ({BRAVE_RATE_LIMIT_RPS}), using default: 1")
-    BRAVE_RATE_LIMIT_RPS = 1
-elif BRAVE_RATE_LIMIT_RPS > 50:
-    logger.warning(f"Rate limit ({BRAVE_RATE_LIMIT_RPS}) exceeds maximum tier (50), capping at 50")
-    BRAVE_RATE_LIMIT_RPS = 50
+    @property
+    def min_request_interval(self) -> float:
+        """Minimum interval between Brave Search requests (in seconds)."""
+        return 1.0 / self.brave_rate_limit_rps
 
-# Calculate minimum interval between requests (in seconds)
-MIN_REQUEST_INTERVAL = 1.0 / BRAVE_RATE_LIMIT_RPS
+def load_config() -> Config:
+    """Build the server configuration from environment variables with validation."""
+    brave_rate_limit_rps = get_int_env('BRAVE_RATE_LIMIT_RPS', 1)  # Default to free tier
+    max_concurrent_fetches = get_int_env('MAX_CONCURRENT_FETCHES', 10)
+    
+    # Validate rate limit configuration
+    if brave_rate_limit_rps < 1:
+        logger.warning(f"Invalid BRAVE_RATE_LIMIT_RPS ({brave_rate_limit_rps}), using default: 1")
+        brave_rate_limit_rps = 1
+    elif brave_rate_limit_rps > 50:
+        logger.warning(f"Rate limit ({brave_rate_limit_rps}) exceeds maximum tier (50), capping at 50")
+        brave_rate_limit_rps = 50
+    
+    if max_concurrent_fetches < 1:
+        logger.warning(f"Invalid MAX_CONCURRENT_FETCHES ({max_concurrent_fetches}), using default: 10")
+        max_concurrent_fetches = 10
+    
+    return Config(
+        brave_api_key=os.getenv('BRAVE_API_KEY', ''),
+        brave_rate_limit_rps=brave_rate_limit_rps,
+        request_timeout=get_int_env('REQUEST_TIMEOUT', 10),
+        content_length_limit=get_int_env('CONTENT_LENGTH_LIMIT', 5000),
+        max_response_size=get_int_env('MAX_RESPONSE_SIZE', 10485760),  # 10MB default
+        max_concurrent_fetches=max_concurrent_fetches,
+        url_cache_ttl_seconds=get_int_env('URL_CACHE_TTL_SECONDS', 3600),  # 1 hour default, 0 disables
+        cache_brave_ttl=get_int_env('CACHE_BRAVE_TTL', 300),  # 5 minutes default, 0 disables
+    )
 
-logger.info(f"Brave Search rate limit configured: {BRAVE_RATE_LIMIT_RPS} requests/second (interval: {MIN_REQUEST_INTERVAL:.3f}s)")
+# Environment configuration
+CFG = load_config()
+
+logger.info(f"Brave Search rate limit configured: {CFG.brave_rate_limit_rps} requests/second (interval: {CFG.min_request_interval:.3f}s)")
 
 # Log version information at startup
 logger.info(f"URL Text Fetcher MCP Server v{__version__} ({__implementation__}) starting up")
 logger.info(f"Environment: Python {'.'.join(map(str, __import__('sys').version_info[:2]))}, MCP SDK, Brave Search API")
 
+# Advertise Brotli and Zstandard only when a decoder for them is installed
+ACCEPT_ENCODINGS = ['gzip', 'deflate']
+try:
+    import zstandard  # noqa: F401
+    ACCEPT_ENCODINGS.insert(0, 'zstd')
+except ImportError:
+    pass
+try:
+    import brotli  # noqa: F401
+    ACCEPT_ENCODINGS.insert(0, 'br')
+except ImportError:
+    pass
+
 # Standard HTTP headers for requests
 HEADERS = {
     'User-Agent': 'Mozilla/5.0 (compatible; MCP-URL-Fetcher/1.0)',
     'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
     'Accept-Language': 'en-US,en;q=0.5',
-    'Accept-Encoding': 'gzip, deflate',
+    'Accept-Encoding': ', '.join(ACCEPT_ENCODINGS),
     'DNT': '1',
     'Connection': 'keep-alive',
     'Upgrade-Insecure-Requests': '1'
 }
 
-# Thread-safe rate limiting for Brave Search API
-rate_limit_lock = threading.Lock()
-last_brave_request = [0]  # Using list for mutable reference
+# Common internal/metadata hostnames that are never fetched
+BLOCKED_HOSTNAMES = frozenset({
+    'localhost', 'metadata.google.internal',
+    '169.254.169.254',  # AWS/GCP metadata
+    'metadata'
+})
+
+# IPv4 ranges that Python's is_private, is_loopback and is_link_local cover, as sorted
+# integer bounds so a resolved address is classified with one bisect
+BLOCKED_IPV4_NETWORKS = (
+    '0.0.0.0/8', '10.0.0.0/8', '127.0.0.0/8', '169.254.0.0/16', '172.16.0.0/12',
+    '192.0.0.0/24', '192.0.2.0/24', '192.168.0.0/16', '198.18.0.0/15', '198.51.100.0/24',
+    '203.0.113.0/24', '240.0.0.0/4',
+)
+BLOCKED_IPV4_STARTS, BLOCKED_IPV4_ENDS = zip(*sorted(
+    (int(network.network_address), int(network.broadcast_address))
+    for network in map(ipaddress.IPv4Network, BLOCKED_IPV4_NETWORKS)
+))
+# Globally reachable anycast addresses inside 192.0.0.0/24
+ALLOWED_IPV4_ADDRESSES = frozenset({0xC0000009, 0xC000000A})  # 192.0.0.9, 192.0.0.10
+
+# Control characters other than tab, newline and carriage return
+CONTROL_CHAR_PATTERN = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+# Potentially dangerous patterns stripped from search queries
+DANGEROUS_QUERY_PATTERN = re.compile(r'<script|javascript:|data:|vbscript:', re.IGNORECASE)
+
+# Pages are parsed with lxml as they stream in. If lxml cannot be imported they are buffered and parsed
+# with selectolax (the optional "fast" extra), or BeautifulSoup's html.parser as a last resort
+try:
+    from lxml.etree import HTMLPullParser
+except ImportError:
+    logger.warning("lxml not installed, buffering pages before parsing them")
+    HTMLPullParser = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    if HTMLPullParser is None:
+        logger.warning("selectolax not installed, parsing pages with BeautifulSoup's html.parser")
+    LexborHTMLParser = None
+
+# The parsing path in use, reported by get_server_info so a degraded install is easy to spot
+HTML_PARSER = "lxml (streaming)" if HTMLPullParser is not None else "selectolax" if LexborHTMLParser is not None else "html.parser"
+
+# Content types worth parsing; anything else is rejected before the body is read
+HTML_CONTENT_TYPES = frozenset({'text/html', 'application/xhtml+xml', 'text/plain', ''})
+
+# Only build <a href> nodes for absolute or root-relative links; the rest of the document is skipped
+LINK_HREF_PATTERN = re.compile(r'^(?:https?://|/)')
+LINK_STRAINER = SoupStrainer("a", href=LINK_HREF_PATTERN)
+LINK_SELECTOR = 'a[href^="http://"], a[href^="https://"], a[href^="/"]'
+
+# Elements whose own text is never visible on the page
+SKIPPED_TEXT_TAGS = frozenset({'script', 'style'})
+
+# Maximum number of links returned by fetch_page_links
+MAX_PAGE_LINKS = 100
+
+class Hit(NamedTuple):
+    """A single Brave Search result."""
+    title: str
+    url: str
+    description: str
+
+class TokenBucket:
+    """Token-bucket rate limiter that admits bursts up to capacity and refills continuously."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.last_refill = time.monotonic()
+        self.lock = threading.Lock()
+
+    async def acquire(self) -> None:
+        """Take a token, sleeping outside the lock until one is available."""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+            self.last_refill = now
+            # Reserve a token up front; a negative balance queues later callers behind us
+            self.tokens -= 1
+            sleep_time = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if sleep_time > 0:
+            logger.info(f"Rate limiting: sleeping for {sleep_time:.3f} seconds (limit: {self.rate:g} req/s)")
+            await asyncio.sleep(sleep_time)
+
+# Rate limiting for Brave Search API; callers waiting for a token yield to the event loop
+brave_rate_limiter = TokenBucket(CFG.brave_rate_limit_rps, CFG.brave_rate_limit_rps)
+
+# Cache of Brave Search results so repeat queries skip the API and the rate limiter
+# (query, count) -> (expires_at, results)
+BRAVE_CACHE_MAX_ENTRIES = 512
+brave_cache: Dict[tuple, tuple] = {}
+brave_cache_lock = threading.Lock()
+
+# Transient gateway errors from the Brave Search API are retried with backoff
+BRAVE_RETRY_STATUSES = frozenset({502, 503, 504})
+BRAVE_MAX_RETRIES = 2
+
+# Bound the number of page downloads in flight at once across all tool calls
+fetch_semaphore = asyncio.Semaphore(CFG.max_concurrent_fetches)
+
+# Cap downloads per host so one site can't take every fetch slot; entries vanish once idle
+MAX_FETCHES_PER_HOST = 8
+host_semaphores: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+
+def get_host_semaphore(url: str) -> asyncio.Semaphore:
+    """Return the semaphore limiting concurrent downloads from the URL's host."""
+    host = urlparse(url).hostname or ''
+    semaphore = host_semaphores.get(host)
+    if semaphore is None:
+        semaphore = host_semaphores[host] = asyncio.Semaphore(MAX_FETCHES_PER_HOST)
+    return semaphore
+
+# In-memory cache of fetched page results: (kind, url) -> (expires_at, value)
+URL_CACHE_MAX_ENTRIES = 512
+url_cache: Dict[tuple, tuple] = {}
+
+# Cache of hostname safety verdicts so repeat fetches skip DNS: hostname -> (expires_at, is_safe)
+HOSTNAME_CACHE_TTL = 600
+HOSTNAME_CACHE_MAX_ENTRIES = 4096
+hostname_cache: Dict[str, tuple] = {}
+hostname_cache_lock = threading.Lock()
+
+# Shared async HTTP client for page fetches, reused across tool calls for connection pooling
+http_client: httpx.AsyncClient | None = None
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared async HTTP client, creating it on first use."""
+    global http_client
+    if http_client is None or http_client.is_closed:
+        http_client = httpx.AsyncClient(
+            headers=HEADERS,
+            timeout=CFG.request_timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=20)
+        )
+    return http_client
+
+# Separate client for the Brave Search API with the subscription token set once
+brave_client: httpx.AsyncClient | None = None
+
+def get_brave_client() -> httpx.AsyncClient:
+    """Return the Brave Search API client, creating it on first use."""
+    global brave_client
+    if brave_client is None or brave_client.is_closed:
+        brave_client = httpx.AsyncClient(
+            headers={
+                **HEADERS,
+                'User-Agent': 'Mozilla/5.0 (compatible; MCP-URL-Fetcher/1.0)',
+                'Accept': 'application/json',  # Brave API requires application/json or */*
+                "X-Subscription-Token": CFG.brave_api_key
+            },
+            timeout=CFG.request_timeout
+        )
+    return brave_client
+
+@asynccontextmanager
+async def lifespan(server: FastMCP) -> AsyncIterator[None]:
+    """Close the shared HTTP clients when the server shuts down."""
+    try:
+        yield
+    finally:
+        for client in (http_client, brave_client):
+            if client is not None:
+                await client.aclose()
+
+# Initialize FastMCP server
+mcp = FastMCP("url-text-fetcher", lifespan=lifespan)
 
 def sanitize_query(query: str) -> str:
     """Sanitize search query to prevent injection attacks and malformed requests."""
@@ -94,7 +312,7 @@ def sanitize_query(query: str) -> str:
         return ""
     
     # Remove null bytes and control characters
-    query = ''.join(char for char in query if ord(char) >= 32 or char in '\t\n\r')
+    query = CONTROL_CHAR_PATTERN.sub('', query)
     
     # Limit query length to prevent abuse
     max_query_length = 500
@@ -103,12 +321,11 @@ def sanitize_query(query: str) -> str:
         logger.warning(f"Query truncated to {max_query_length} characters")
     
     # Remove potentially dangerous patterns
-    dangerous_patterns = ['<script', 'javascript:', 'data:', 'vbscript:']
-    query_lower = query.lower()
-    for pattern in dangerous_patterns:
-        if pattern in query_lower:
-            logger.warning(f"Potentially dangerous pattern detected in query: {pattern}")
-            query = query.replace(pattern, '')
+    cleaned, removed = DANGEROUS_QUERY_PATTERN.subn('', query)
+    if removed:
+        for pattern in DANGEROUS_QUERY_PATTERN.findall(query):
+            logger.warning(f"Potentially dangerous pattern detected in query: {pattern.lower()}")
+    query = cleaned
     
     return query.strip()
 
@@ -118,7 +335,7 @@ def sanitize_url(url: str) -> str:
         return ""
     
     # Remove whitespace and control characters
-    url = ''.join(char for char in url if ord(char) >= 32 or char in '\t\n\r')
+    url = CONTROL_CHAR_PATTERN.sub('', url)
     url = url.strip()
     
     # Ensure URL has protocol
@@ -129,6 +346,43 @@ def sanitize_url(url: str) -> str:
     
     return url
 
+def is_blocked_ipv4(address: str) -> bool:
+    """Check whether a dotted-quad IPv4 address falls in a private or internal range."""
+    value = int.from_bytes(socket.inet_aton(address), 'big')
+    index = bisect.bisect_right(BLOCKED_IPV4_STARTS, value) - 1
+    return index >= 0 and value <= BLOCKED_IPV4_ENDS[index] and value not in ALLOWED_IPV4_ADDRESSES
+
+def is_safe_hostname(hostname: str) -> bool:
+    """Resolve a hostname and check none of its addresses are internal, caching the verdict."""
+    hostname = hostname.lower()
+    with hostname_cache_lock:
+        entry = hostname_cache.get(hostname)
+    if entry is not None and time.monotonic() < entry[0]:
+        return entry[1]
+    
+    verdict = True
+    try:
+        # IPv4 only, so resolution doesn't stall on IPv6 lookups; check every address returned
+        addresses = {info[4][0] for info in socket.getaddrinfo(hostname, None, socket.AF_INET)}
+        # Block private/internal IP ranges
+        if any(is_blocked_ipv4(address) for address in addresses):
+            verdict = False
+        
+    except socket.gaierror:
+        # DNS resolution failed - domain doesn't exist or network issue
+        # Block it, but don't cache the verdict so a transient failure is retried next time
+        return False
+    except (ValueError, OSError):
+        # Invalid IP address format
+        verdict = False
+    
+    with hostname_cache_lock:
+        if hostname not in hostname_cache and len(hostname_cache) >= HOSTNAME_CACHE_MAX_ENTRIES:
+            # Evict the oldest entry
+            hostname_cache.pop(next(iter(hostname_cache)))
+        hostname_cache[hostname] = (time.monotonic() + HOSTNAME_CACHE_TTL, verdict)
+    return verdict
+
 def is_safe_url(url: str) -> bool:
     """Validate URL is safe to fetch - prevents SSRF attacks."""
     try:
@@ -143,160 +397,357 @@ def is_safe_url(url: str) -> bool:
             return False
             
         # Block common internal/metadata hostnames
-        blocked_hostnames = [
-            'localhost', 'metadata.google.internal',
-            '169.254.169.254',  # AWS/GCP metadata
-            'metadata'
-        ]
-        
-        if hostname.lower() in blocked_hostnames:
-            return False
-            
-        # Try to resolve hostname to IP to check for internal addresses
-        try:
-            import socket
-            ip = socket.gethostbyname(hostname)
-            ip_obj = ipaddress.ip_address(ip)
-            
-            # Block private/internal IP ranges
-            if ip_obj.is_private or ip_obj.is_loopback or ip_obj.is_link_local:
-                return False
-                
-        except socket.gaierror:
-            # DNS resolution failed - domain doesn't exist or network issue
-            # For safety in production, we should block unknown domains
-            return False
-        except ValueError:
-            # Invalid IP address format
+        if hostname.lower() in BLOCKED_HOSTNAMES:
             return False
             
-        return True
+        # Resolve hostname to IP to check for internal addresses
+        return is_safe_hostname(hostname)
         
     except Exception:
         # Any other parsing error - block to be safe
         return False
 
-def fetch_url_content(url: str) -> str:
-    """Helper function to fetch text content from a URL with safety checks."""
-    # Validate URL safety first
-    if not is_safe_url(url):
-        logger.warning(f"SECURITY: Blocked unsafe URL: {url}")
-        return "Error: URL not allowed for security reasons"
+async def prevalidate_urls(urls: List[str]) -> Dict[str, bool]:
+    """Run is_safe_url for many URLs at once, resolving their hosts in parallel worker threads."""
+    unique_urls = list(dict.fromkeys(urls))
+    verdicts = await asyncio.gather(*(asyncio.to_thread(is_safe_url, url) for url in unique_urls))
+    return dict(zip(unique_urls, verdicts))
+
+def cache_ttl(cache_control: str) -> int:
+    """Return how long a response may be cached, honoring the server's Cache-Control header."""
+    directives = [d.strip().lower() for d in cache_control.split(',')]
+    if 'no-store' in directives or 'no-cache' in directives:
+        return 0
+    ttl = CFG.url_cache_ttl_seconds
+    for directive in directives:
+        if directive.startswith('max-age='):
+            try:
+                ttl = min(ttl, int(directive[len('max-age='):]))
+            except ValueError:
+                pass
+    return max(ttl, 0)
+
+def get_cached(key: tuple, allow_stale: bool = False) -> Any:
+    """Return a cached value, or None if missing or expired (unless allow_stale is set)."""
+    entry = url_cache.get(key)
+    if entry is None:
+        return None
+    expires_at, value = entry
+    if allow_stale or time.monotonic() < expires_at:
+        return value
+    return None
+
+def store_cached(key: tuple, value: Any, cache_control: str) -> None:
+    """Cache a fetched value for the lifetime allowed by URL_CACHE_TTL_SECONDS and Cache-Control."""
+    ttl = cache_ttl(cache_control)
+    if ttl <= 0:
+        return
+    if key not in url_cache and len(url_cache) >= URL_CACHE_MAX_ENTRIES:
+        # Evict the oldest entry
+        url_cache.pop(next(iter(url_cache)))
+    url_cache[key] = (time.monotonic() + ttl, value)
+
+def collect_link_events(parser, links: list) -> None:
+    """Drain pending <a> end events from an lxml pull parser into links, stopping once past MAX_PAGE_LINKS."""
+    for _, elem in parser.read_events():
+        href = elem.get('href')
+        if href and href.startswith(('http://', 'https://', '/')):
+            links.append(href)
+            if len(links) > MAX_PAGE_LINKS:
+                # One past the limit is enough to know the list is truncated
+                return
+        # Drop walked subtrees to keep memory flat
+        elem.clear(keep_tail=True)
+        parent = elem.getparent()
+        if parent is not None:
+            while elem.getprevious() is not None:
+                del parent[0]
+
+def format_page_links(url: str, valid_links: list, truncated: bool) -> str:
+    """Format collected page links as the fetch_page_links tool response."""
+    links_text = "\n".join(f"- {link}" for link in valid_links[:MAX_PAGE_LINKS])
+    total = f"{MAX_PAGE_LINKS}+" if truncated else len(valid_links)
     
+    return f"Links found on {url} ({total} total, showing first {MAX_PAGE_LINKS}):\n\n{links_text}"
+
+def lookup_codec(label: str | None) -> str | None:
+    """Map a charset label to a Python codec name, or None if Python can't decode it."""
+    if not label:
+        return None
+    label = label.strip().lower()
     try:
-        # Log request for monitoring
-        logger.info(f"REQUEST: Fetching content from {url}")
+        return codecs.lookup(UnicodeDammit.CHARSET_ALIASES.get(label, label)).name
+    except LookupError:
+        return None
+
+def open_html_decoder(declared: str | None, head: bytes) -> tuple[codecs.IncrementalDecoder, bytes]:
+    """Pick a decoder for an HTML body (BOM, declared charset, <meta charset>, then UTF-8) and strip any BOM from its first chunk."""
+    head, bom_encoding = EncodingDetector.strip_byte_order_mark(head)
+    codec = (
+        lookup_codec(bom_encoding)
+        or lookup_codec(declared)
+        or lookup_codec(EncodingDetector.find_declared_encoding(head, is_html=True))
+        or 'utf-8'
+    )
+    return codecs.getincrementaldecoder(codec)(errors='replace'), head
+
+class VisibleTextCollector:
+    """Collect visible text from HTML as it streams in, using lxml's pull parser."""
+
+    def __init__(self, encoding: str | None = None):
+        self.encoding = encoding
+        self.decoder = None
+        self.parser = None
+        self.parts = []
+        self.length = 0
+        # Text or tail of the last element seen; it is only complete once the next event arrives
+        self.pending = None
+
+    def feed(self, chunk: bytes) -> None:
+        """Parse the next chunk of the body and collect any text it completes."""
+        if self.parser is None:
+            # Decode in Python rather than handing the label to libxml2, which rejects many charset
+            # aliases and assumes Latin-1 when none is given; callers feed 64 KiB chunks, so any
+            # <meta charset> (required in the first 1024 bytes) is in this one
+            self.decoder, chunk = open_html_decoder(self.encoding, chunk)
+            self.parser = HTMLPullParser(events=('start', 'end', 'comment', 'pi'))
+        self.parser.feed(self.decoder.decode(chunk))
+        self.drain()
+
+    def close(self) -> str:
+        """Finish parsing and return the collected text, one stripped string per line."""
+        if self.parser is not None:
+            self.parser.feed(self.decoder.decode(b'', final=True))
+            self.parser.close()
+            self.drain()
+            self.flush()
+        return "\n".join(self.parts)
+
+    def flush(self) -> None:
+        """Emit the pending text or tail, which the latest event has completed."""
+        if self.pending is None:
+            return
+        elem, attr = self.pending
+        self.pending = None
+        if attr == 'text':
+            if elem.tag in SKIPPED_TEXT_TAGS:
+                return
+            value = elem.text
+        else:
+            value = elem.tail
+        if value and (value := value.strip()):
+            # Length of the joined text, counting the newline separators
+            self.length += len(value) + (1 if self.parts else 0)
+            self.parts.append(value)
+
+    def drain(self) -> None:
+        """Walk the parser's pending events, collecting completed text as we go."""
+        for event, elem in self.parser.read_events():
+            self.flush()
+            if event == 'start':
+                self.pending = (elem, 'text')
+            else:
+                self.pending = (elem, 'tail')
+                if event == 'end':
+                    # Drop walked subtrees to keep memory flat; the root's siblings (comments
+                    # or processing instructions before <html>) have no parent to delete from
+                    elem.clear(keep_tail=True)
+                    parent = elem.getparent()
+                    if parent is not None:
+                        while elem.getprevious() is not None:
+                            del parent[0]
+
+def extract_visible_text(html_content: bytes, encoding: str | None = None) -> str:
+    """Parse HTML and return its visible text with script and style elements removed."""
+    if LexborHTMLParser is not None:
+        try:
+            # Decode using the declared charset, or sniff <meta charset>, since Lexbor assumes UTF-8
+            markup = UnicodeDammit(html_content, [encoding] if encoding else [], is_html=True).unicode_markup
+            tree = LexborHTMLParser(markup)
+            
+            # Remove script and style elements
+            for node in tree.css('script, style'):
+                node.decompose()
+            
+            # Join on NUL (never present in parsed HTML text) so whitespace-only parts can be
+            # dropped, matching BeautifulSoup's get_text(separator="\n", strip=True)
+            parts = tree.root.text(separator='\x00', strip=True).split('\x00') if tree.root else []
+            return "\n".join(part for part in parts if part)
+        except Exception as e:
+            logger.warning(f"PARSE: selectolax failed, falling back to BeautifulSoup: {e}")
+    
+    # Parse with BeautifulSoup
+    soup = BeautifulSoup(html_content, "html.parser", from_encoding=encoding)
+    
+    # Remove script and style elements
+    for script in soup(["script", "style"]):
+        script.decompose()
         
-        # Make request with streaming to check size
-        resp = requests.get(url, headers=HEADERS, timeout=REQUEST_TIMEOUT, stream=True)
+    return soup.get_text(separator="\n", strip=True)
+
+class PageRejected(Exception):
+    """Raised when a page response is refused before its body is read; the message is the tool's error text."""
+
+@asynccontextmanager
+async def open_page(url: str) -> AsyncIterator[httpx.Response]:
+    """Stream a GET for an already-validated URL under the fetch limits, rejecting non-HTML and oversized responses."""
+    async with get_host_semaphore(url), fetch_semaphore, get_http_client().stream("GET", url) as resp:
         resp.raise_for_status()
         
         # Log response details
         logger.info(f"RESPONSE: {resp.status_code} from {url}, Content-Type: {resp.headers.get('Content-Type', 'unknown')}")
         
+        # Skip non-HTML responses (PDFs, images, JSON...) without downloading them
+        content_type = resp.headers.get('Content-Type', '').split(';')[0].strip().lower()
+        if content_type not in HTML_CONTENT_TYPES:
+            logger.warning(f"CONTENT: Unsupported Content-Type {content_type} for {url}")
+            raise PageRejected(f"Error: Unsupported Content-Type: {content_type}")
+        
         # Check content length header
         content_length = resp.headers.get('Content-Length')
-        if content_length and int(content_length) > MAX_RESPONSE_SIZE:
+        if content_length and int(content_length) > CFG.max_response_size:
             logger.warning(f"SECURITY: Content too large: {content_length} bytes for {url}")
-            return f"Error: Content too large ({content_length} bytes, max {MAX_RESPONSE_SIZE})"
+            raise PageRejected(f"Error: Content too large ({content_length} bytes, max {CFG.max_response_size})")
+        
+        yield resp
 
-        # Read content with size limit
-        content_chunks = []
-        total_size = 0
+async def fetch_url_content(url: str, safe: bool | None = None) -> str:
+    """Helper function to fetch text content from a URL with safety checks; pass safe to reuse an earlier is_safe_url verdict."""
+    # Validate URL safety first
+    if safe is None:
+        safe = is_safe_url(url)
+    if not safe:
+        logger.warning(f"SECURITY: Blocked unsafe URL: {url}")
+        return "Error: URL not allowed for security reasons"
+    
+    cached = get_cached(('text', url))
+    if cached is not None:
+        logger.info(f"CACHE_HIT: Returning cached content for {url}")
+        return cached
+    
+    try:
+        # Log request for monitoring
+        logger.info(f"REQUEST: Fetching content from {url}")
         
-        try:
-            for chunk in resp.iter_content(chunk_size=8192, decode_unicode=True):
-                if chunk:  # filter out keep-alive new chunks
+        # Make request with streaming to check size
+        async with open_page(url) as resp:
+            cache_control = resp.headers.get('Cache-Control', '')
+            
+            # Read raw bytes with size limit; the parser decodes them once using the
+            # declared charset (or sniffs <meta charset> when none is declared)
+            encoding = resp.charset_encoding
+            
+            if HTMLPullParser is not None:
+                # Parse as the body streams in so the page is never buffered whole
+                collector = VisibleTextCollector(encoding)
+                total_size = 0
+                async for chunk in resp.aiter_bytes(chunk_size=65536):
                     total_size += len(chunk)
-                    if total_size > MAX_RESPONSE_SIZE:
+                    if total_size > CFG.max_response_size:
                         logger.warning(f"SECURITY: Content exceeded size limit for {url}")
-                        return f"Error: Content exceeded size limit ({MAX_RESPONSE_SIZE} bytes)"
-                    content_chunks.append(chunk)
-        except UnicodeDecodeError:
-            # If we can't decode as text, it's probably binary content
-            logger.warning(f"CONTENT: Unable to decode content as text from {url}")
-            return "Error: Unable to decode content as text"
-        
-        html_content = ''.join(content_chunks)
-        
-        # Parse with BeautifulSoup
-        soup = BeautifulSoup(html_content, "html.parser")
+                        return f"Error: Content exceeded size limit ({CFG.max_response_size} bytes)"
+                    collector.feed(chunk)
+                    if collector.length > CFG.content_length_limit:
+                        # We already have more text than we'll return; stop downloading the rest
+                        logger.info(f"CONTENT: Stopped reading {url} after {total_size} bytes, text limit reached")
+                        break
+                text_content = collector.close()
+            else:
+                html_content = bytearray()
+                async for chunk in resp.aiter_bytes(chunk_size=65536):
+                    html_content.extend(chunk)
+                    if len(html_content) > CFG.max_response_size:
+                        logger.warning(f"SECURITY: Content exceeded size limit for {url}")
+                        return f"Error: Content exceeded size limit ({CFG.max_response_size} bytes)"
+                text_content = None
         
-        # Remove script and style elements
-        for script in soup(["script", "style"]):
-            script.decompose()
-            
-        text_content = soup.get_text(separator="\n", strip=True)
+        if text_content is None:
+            # Parse off the event loop so concurrent fetches aren't serialized behind the parser
+            text_content = await asyncio.to_thread(extract_visible_text, bytes(html_content), encoding)
         
         # Limit final content length
-        if len(text_content) > CONTENT_LENGTH_LIMIT:
-            logger.info(f"CONTENT: Truncating content from {url} ({len(text_content)} -> {CONTENT_LENGTH_LIMIT} chars)")
-            text_content = text_content[:CONTENT_LENGTH_LIMIT] + "... [Content truncated]"
+        if len(text_content) > CFG.content_length_limit:
+            logger.info(f"CONTENT: Truncating content from {url} ({len(text_content)} -> {CFG.content_length_limit} chars)")
+            text_content = text_content[:CFG.content_length_limit] + "... [Content truncated]"
         
         logger.info(f"SUCCESS: Fetched {len(text_content)} characters from {url}")
+        store_cached(('text', url), text_content, cache_control)
         return text_content
         
-    except requests.RequestException as e:
+    except PageRejected as e:
+        return str(e)
+    except httpx.HTTPError as e:
         logger.error(f"REQUEST_ERROR: Failed to fetch {url}: {e}")
+        # Serve a stale copy rather than an error if we have one
+        stale = get_cached(('text', url), allow_stale=True)
+        if stale is not None:
+            logger.info(f"CACHE_STALE: Returning stale content for {url}")
+            return stale
         return "Error: Unable to fetch URL content"
     except Exception as e:
         logger.error(f"UNEXPECTED_ERROR: Processing {url}: {e}", exc_info=True)
         return "Error: An unexpected error occurred while processing the URL"
 
-def brave_search(query: str, count: int = 10) -> List[dict]:
-    """Perform a Brave search and return results with thread-safe rate limiting."""
-    if not BRAVE_API_KEY:
+async def brave_search(query: str, count: int = 10, use_cache: bool = True) -> List[Hit]:
+    """Perform a Brave search and return results with async rate limiting and caching."""
+    if not CFG.brave_api_key:
         logger.error("Brave Search API key not configured")
         raise ValueError("BRAVE_API_KEY environment variable is required")
     
-    # Thread-safe rate limiting: ensure minimum interval between requests
-    with rate_limit_lock:
-        current_time = time.time()
-        time_since_last_request = current_time - last_brave_request[0]
-        if time_since_last_request < MIN_REQUEST_INTERVAL:
-            sleep_time = MIN_REQUEST_INTERVAL - time_since_last_request
-            logger.info(f"Rate limiting: sleeping for {sleep_time:.3f} seconds (limit: {BRAVE_RATE_LIMIT_RPS} req/s)")
-            time.sleep(sleep_time)
-        last_brave_request[0] = time.time()
+    cache_key = (query, count)
+    if use_cache:
+        with brave_cache_lock:
+            entry = brave_cache.get(cache_key)
+        if entry is not None and time.monotonic() < entry[0]:
+            logger.info(f"SEARCH_CACHE_HIT: Returning cached results for '{query}' (count={count})")
+            return list(entry[1])
+    
+    # Async rate limiting: wait for a token from the Brave Search bucket
+    await brave_rate_limiter.acquire()
     
     url = "https://api.search.brave.com/res/v1/web/search"
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (compatible; MCP-URL-Fetcher/1.0)',
-        'Accept': 'application/json',  # Brave API requires application/json or */*
-        "X-Subscription-Token": BRAVE_API_KEY
-    }
     params = {
         "q": query,
         "count": count,
         "search_lang": "en",
         "country": "US",
-        "safesearch": "moderate"
+        "safesearch": "moderate",
+        "result_filter": "web"  # Only web results are used; skip news, videos, etc.
     }
     
     try:
         logger.info(f"SEARCH_REQUEST: Making Brave Search for '{query}' (count={count})")
-        response = requests.get(url, headers=headers, params=params, timeout=REQUEST_TIMEOUT)
+        for attempt in range(BRAVE_MAX_RETRIES + 1):
+            response = await get_brave_client().get(url, params=params)
+            if response.status_code not in BRAVE_RETRY_STATUSES or attempt == BRAVE_MAX_RETRIES:
+                break
+            logger.warning(f"SEARCH_RETRY: Brave Search returned {response.status_code}, retrying")
+            await asyncio.sleep(0.2 * 2 ** attempt)
+            # Retries count against the API rate limit like any other request
+            await brave_rate_limiter.acquire()
         
         # Log response details for debugging
         logger.info(f"SEARCH_RESPONSE: Status {response.status_code}, Content-Type: {response.headers.get('Content-Type', 'unknown')}")
         
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
         
         results = []
         if 'web' in data and 'results' in data['web']:
             for result in data['web']['results']:
-                results.append({
-                    'title': result.get('title', ''),
-                    'url': result.get('url', ''),
-                    'description': result.get('description', ''),
-                })
+                results.append(Hit(result.get('title', ''), result.get('url', ''), result.get('description', '')))
         else:
             logger.warning(f"Unexpected response structure: {data}")
         
         logger.info(f"SEARCH_SUCCESS: Found {len(results)} results for '{query}'")
+        if CFG.cache_brave_ttl > 0:
+            with brave_cache_lock:
+                if cache_key not in brave_cache and len(brave_cache) >= BRAVE_CACHE_MAX_ENTRIES:
+                    # Evict the oldest entry
+                    brave_cache.pop(next(iter(brave_cache)))
+                brave_cache[cache_key] = (time.monotonic() + CFG.cache_brave_ttl, tuple(results))
         return results
-    except requests.HTTPError as e:
+    except httpx.HTTPStatusError as e:
         logger.error(f"Brave Search API error: {e.response.status_code}")
         logger.error(f"Response headers: {dict(e.response.headers)}")
         logger.error(f"Response body: {e.response.text}")
@@ -310,7 +761,7 @@ def brave_search(query: str, count: int = 10) -> List[dict]:
             raise Exception("Rate limit exceeded - please wait before making another request")
         else:
             raise Exception(f"Search service error: {e.response.status_code} - {e.response.text}")
-    except requests.RequestException as e:
+    except httpx.HTTPError as e:
         logger.error(f"Network error during search: {e}")
         raise Exception("Network error occurred during search")
     except Exception as e:
@@ -328,10 +779,14 @@ async def get_server_info() -> str:
         f"URL Text Fetcher MCP Server",
         f"Version: {__version__}",
         f"Implementation: {__implementation__}",
-        f"Brave Search Rate Limit: {BRAVE_RATE_LIMIT_RPS} requests/second",
-        f"Request Timeout: {REQUEST_TIMEOUT} seconds",
-        f"Content Limit: {CONTENT_LENGTH_LIMIT:,} characters",
-        f"Max Response Size: {MAX_RESPONSE_SIZE:,} bytes",
+        f"Brave Search Rate Limit: {CFG.brave_rate_limit_rps} requests/second",
+        f"Request Timeout: {CFG.request_timeout} seconds",
+        f"Content Limit: {CFG.content_length_limit:,} characters",
+        f"Max Response Size: {CFG.max_response_size:,} bytes",
+        f"Max Concurrent Fetches: {CFG.max_concurrent_fetches}",
+        f"URL Cache TTL: {CFG.url_cache_ttl_seconds} seconds",
+        f"Search Cache TTL: {CFG.cache_brave_ttl} seconds",
+        f"HTML Parser: {HTML_PARSER}",
         "",
         "Available Tools:",
         "• fetch_url_text - Download visible text from any URL",
@@ -344,9 +799,9 @@ async def get_server_info() -> str:
         "• SSRF protection against internal network access",
         "• Input sanitization for URLs and search queries",
         "• Content size limiting and memory protection",
-        "• Thread-safe rate limiting for API requests",
+        "• Non-blocking rate limiting for API requests",
         "",
-        f"Brave API Key: {'✓ Configured' if BRAVE_API_KEY else '✗ Missing'}"
+        f"Brave API Key: {'✓ Configured' if CFG.brave_api_key else '✗ Missing'}"
     ]
     
     return "\n".join(info)
@@ -358,12 +813,12 @@ async def test_brave_search(query: str = "test") -> str:
     Args:
         query: Test query to search for (default: "test")
     """
-    if not BRAVE_API_KEY:
+    if not CFG.brave_api_key:
         return "❌ Error: BRAVE_API_KEY environment variable not set"
     
     try:
         logger.info(f"Testing Brave Search API with query: '{query}'")
-        results = brave_search(query, count=1)
+        results = await brave_search(query, count=1, use_cache=False)
         
         if results:
             result = results[0]
@@ -373,12 +828,12 @@ Query: {query}
 Found: {len(results)} result(s)
 
 First Result:
-Title: {result.get('title', 'No title')}
-URL: {result.get('url', 'No URL')}
-Description: {result.get('description', 'No description')}
+Title: {result.title or 'No title'}
+URL: {result.url or 'No URL'}
+Description: {result.description or 'No description'}
 
-API Key: ✓ Valid (length: {len(BRAVE_API_KEY)})
-Rate Limit: {BRAVE_RATE_LIMIT_RPS} requests/second"""
+API Key: ✓ Valid (length: {len(CFG.brave_api_key)})
+Rate Limit: {CFG.brave_rate_limit_rps} requests/second"""
         else:
             return f"⚠️ API connection successful but no results found for query: '{query}'"
             
@@ -398,7 +853,7 @@ async def fetch_url_text(url: str) -> str:
         return "Error: Invalid URL format"
         
     logger.info(f"Fetching URL text: {url}")
-    content = fetch_url_content(url)
+    content = await fetch_url_content(url)
     
     return f"Text content from {url}:\n\n{content}"
 
@@ -420,42 +875,78 @@ async def fetch_page_links(url: str) -> str:
         return "Error: URL not allowed for security reasons"
         
     try:
-        logger.info(f"Fetching page links: {url}")
-        resp = requests.get(url, headers=HEADERS, timeout=REQUEST_TIMEOUT, stream=True)
-        resp.raise_for_status()
-        
-        # Check content length
-        content_length = resp.headers.get('Content-Length')
-        if content_length and int(content_length) > MAX_RESPONSE_SIZE:
-            return f"Error: Page too large ({content_length} bytes)"
-        
-        # Read content with size limit
-        content_chunks = []
-        total_size = 0
-        
-        for chunk in resp.iter_content(chunk_size=8192, decode_unicode=True):
-            if chunk:
-                total_size += len(chunk)
-                if total_size > MAX_RESPONSE_SIZE:
-                    return "Error: Page content too large"
-                content_chunks.append(chunk)
-        
-        html_content = ''.join(content_chunks)
-        soup = BeautifulSoup(html_content, "html.parser")
-        links = [a.get('href') for a in soup.find_all('a', href=True) if a.get('href')]
-        
-        # Filter and clean links
-        valid_links = []
-        for link in links:
-            if link.startswith(('http://', 'https://', '/')):
-                valid_links.append(link)
-        
-        links_text = "\n".join(f"- {link}" for link in valid_links[:100])  # Limit to 100 links
+        cached = get_cached(('links', url))
+        if cached is not None:
+            logger.info(f"CACHE_HIT: Returning cached links for {url}")
+            valid_links, truncated = cached
+            return format_page_links(url, valid_links, truncated)
         
-        return f"Links found on {url} ({len(valid_links)} total, showing first 100):\n\n{links_text}"
+        logger.info(f"Fetching page links: {url}")
+        async with open_page(url) as resp:
+            cache_control = resp.headers.get('Cache-Control', '')
+            
+            valid_links = []
+            truncated = False
+            total_size = 0
+            
+            if HTMLPullParser is not None:
+                # Stream the page through lxml and collect hrefs as each <a> closes,
+                # so the body is never buffered and we can stop once we have enough links
+                parser = HTMLPullParser(events=('end',), tag='a')
+                decoder = None
+                async for chunk in resp.aiter_bytes(chunk_size=65536):
+                    if not chunk:
+                        continue
+                    total_size += len(chunk)
+                    if total_size > CFG.max_response_size:
+                        return "Error: Page content too large"
+                    if decoder is None:
+                        # Decode with the declared or sniffed charset; libxml2 would assume Latin-1
+                        decoder, chunk = open_html_decoder(resp.charset_encoding, chunk)
+                    parser.feed(decoder.decode(chunk))
+                    collect_link_events(parser, valid_links)
+                    if len(valid_links) > MAX_PAGE_LINKS:
+                        truncated = True
+                        break
+                else:
+                    if decoder is not None:
+                        parser.feed(decoder.decode(b'', final=True))
+                    parser.close()
+                    collect_link_events(parser, valid_links)
+                    truncated = len(valid_links) > MAX_PAGE_LINKS
+            else:
+                # Read raw bytes with size limit and let the parser handle decoding
+                html_content = bytearray()
+                
+                async for chunk in resp.aiter_bytes(chunk_size=65536):
+                    html_content.extend(chunk)
+                    if len(html_content) > CFG.max_response_size:
+                        return "Error: Page content too large"
+                
+                if LexborHTMLParser is not None:
+                    # Decode using the declared charset, or sniff <meta charset>, since Lexbor assumes UTF-8
+                    declared = [resp.charset_encoding] if resp.charset_encoding else []
+                    tree = LexborHTMLParser(UnicodeDammit(bytes(html_content), declared, is_html=True).unicode_markup)
+                    # The selector keeps only http(s) and root-relative links, filtering in C
+                    valid_links = [node.attributes['href'] for node in tree.css(LINK_SELECTOR)]
+                else:
+                    soup = BeautifulSoup(bytes(html_content), "html.parser", parse_only=LINK_STRAINER,
+                                         from_encoding=resp.charset_encoding)
+                    valid_links = [a['href'] for a in soup.find_all('a')]
+
+        store_cached(('links', url), (valid_links, truncated), cache_control)
+        return format_page_links(url, valid_links, truncated)
         
-    except requests.RequestException as e:
+    except PageRejected as e:
+        return str(e)
+    except httpx.HTTPError as e:
         logger.error(f"Request failed for {url}: {e}")
+        # Serve a stale copy rather than an error if we have one
+        stale = get_cached(('links', url), allow_stale=True)
+        if stale is not None:
+            logger.info(f"CACHE_STALE: Returning stale links for {url}")
+            valid_links, truncated = stale
+            return format_page_links(url, valid_links, truncated)
         return "Error: Unable to fetch page"
     except Exception as e:
         logger.error(f"Unexpected error fetching links from {url}: {e}", exc_info=True)
@@ -478,46 +969,38 @@ async def brave_search_and_fetch(query: str, max_results: int = 3) -> str:
     
     try:
         logger.info(f"Performing Brave search: {query}")
-        search_results = brave_search(query, count=max_results * 2)
+        search_results = await brave_search(query, count=max_results * 2)
         
         if not search_results:
             return f"No search results found for query: {query}"
         
+        # Fetch content for the top results concurrently
+        top_results = [hit for hit in search_results if hit.url][:max_results]
+        # Check every result's host up front, in parallel, instead of one DNS lookup per fetch
+        safe_urls = await prevalidate_urls([hit.url for hit in top_results])
+        contents = await asyncio.gather(*(fetch_url_content(hit.url, safe_urls[hit.url]) for hit in top_results))
+        
         # Build response with search results and content
-        response_parts = [f"Search Results for: {query}", "=" * 50, ""]
+        out = io.StringIO()
+        out.write(f"Search Results for: {query}\n{'=' * 50}\n")
         
-        fetched_count = 0
-        for result in search_results:
-            if fetched_count >= max_results:
-                break
-                
-            title = result.get('title', 'No title')
-            url = result.get('url', '')
-            description = result.get('description', 'No description')
-            
-            response_parts.append(f"{fetched_count + 1}. {title}")
-            response_parts.append(f"   URL: {url}")
-            response_parts.append(f"   Description: {description}")
+        # Limit content per result
+        max_content_per_result = CFG.content_length_limit // max_results
+        for index, (hit, content) in enumerate(zip(top_results, contents), start=1):
+            title, url, description = hit
             
-            # Fetch content from this URL
-            if url:
-                content = fetch_url_content(url)
-                # Limit content per result
-                max_content_per_result = CONTENT_LENGTH_LIMIT // max_results
-                if len(content) > max_content_per_result:
-                    content = content[:max_content_per_result] + "... [Truncated]"
-                response_parts.append(f"   Content: {content}")
-                fetched_count += 1
-            else:
-                response_parts.append("   Content: No URL available")
-            
-            response_parts.append("")  # Add spacing
+            if len(content) > max_content_per_result:
+                content = content[:max_content_per_result] + "... [Truncated]"
+            out.write(f"\n{index}. {title}\n   URL: {url}\n   Description: {description}\n   Content: {content}\n")
+            if out.tell() > CFG.content_length_limit:
+                # Everything after this point would be cut by the final length check
+                break
         
-        final_response = "\n".join(response_parts)
+        final_response = out.getvalue()
         
         # Final length check
-        if len(final_response) > CONTENT_LENGTH_LIMIT:
-            final_response = final_response[:CONTENT_LENGTH_LIMIT] + "... [Response truncated]"
+        if len(final_response) > CFG.content_length_limit:
+            final_response = final_response[:CFG.content_length_limit] + "... [Response truncated]"
         
         return final_response
         
@@ -529,6 +1012,14 @@ async def brave_search_and_fetch(query: str, max_results: int = 3) -> str:
 
 def main():
     """Main entry point for the FastMCP server."""
+    # uvloop is a faster libuv-backed event loop; it isn't available on Windows
+    if sys.platform != 'win32':
+        try:
+            import uvloop
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+            logger.info("Using uvloop event loop")
+        except ImportError:
+            logger.warning("uvloop not installed, using the default asyncio event loop")
     mcp.run(transport='stdio')
 
 if __name__ == "__main__":
@@ -0,0 +1,41 @@
+import asyncio
+import importlib
+import sys
+
+import httpx
+import pytest
+
+SERVER_MODULES = ["url_text_fetcher.server", "url_text_fetcher.server_fastmcp"]
+
+
+@pytest.fixture(params=SERVER_MODULES)
+def server(request, monkeypatch):
+    """Each server module, with an empty page cache."""
+    module = importlib.import_module(request.param)
+    monkeypatch.setattr(module, "url_cache", {})
+    return module
+
+
+def serve(module, handler, call):
+    """Run a coroutine from `call(module)` with the shared HTTP client answering through `handler`."""
+    async def run():
+        module.http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            return await call(module)
+        finally:
+            await module.http_client.aclose()
+            module.http_client = None
+    return asyncio.run(run())
+
+
+def html_response(body: bytes, content_type: str = "text/html"):
+    """A MockTransport handler that answers every request with body."""
+    return lambda request: httpx.Response(200, content=body, headers={"Content-Type": content_type})
+
+
+def import_without(monkeypatch, name: str, blocked):
+    """Import a fresh copy of module name as if the blocked packages were not installed."""
+    for package in blocked:
+        monkeypatch.setitem(sys.modules, package, None)
+    monkeypatch.delitem(sys.modules, name, raising=False)
+    return importlib.import_module(name)
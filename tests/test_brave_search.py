@@ -0,0 +1,48 @@
+import asyncio
+import dataclasses
+import time
+
+import httpx
+import pytest
+
+
+def run_search(server, monkeypatch, statuses):
+    """Run one uncached brave_search against a mock API answering with statuses; return (results, request times)."""
+    monkeypatch.setattr(server, "CFG", dataclasses.replace(server.CFG, brave_api_key="key"))
+    monkeypatch.setattr(server, "brave_rate_limiter", server.TokenBucket(2, 1))
+    responses = iter(statuses)
+    sent = []
+
+    def handler(request):
+        sent.append(time.monotonic())
+        body = {"web": {"results": [{"title": "t", "url": "http://a", "description": "d"}]}}
+        return httpx.Response(next(responses), json=body, request=request)
+
+    async def run():
+        server.brave_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            return await server.brave_search("q", use_cache=False)
+        finally:
+            await server.brave_client.aclose()
+            server.brave_client = None
+
+    return asyncio.run(run()), sent
+
+
+def test_results_are_hits(server, monkeypatch):
+    results, sent = run_search(server, monkeypatch, [200])
+    assert results == [server.Hit("t", "http://a", "d")]
+    assert len(sent) == 1
+
+
+def test_retries_respect_rate_limit(server, monkeypatch):
+    results, sent = run_search(server, monkeypatch, [503, 502, 200])
+    assert results == [server.Hit("t", "http://a", "d")]
+    assert len(sent) == 3
+    gaps = [later - earlier for earlier, later in zip(sent, sent[1:])]
+    assert min(gaps) >= 0.49  # one token per 0.5s, longer than the retry backoff
+
+
+def test_exhausted_retries_raise(server, monkeypatch):
+    with pytest.raises(Exception, match="Search service"):
+        run_search(server, monkeypatch, [503, 503, 503])
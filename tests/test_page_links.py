@@ -0,0 +1,45 @@
+import pytest
+
+from conftest import html_response, serve
+
+URL = "http://93.184.216.34/page"
+
+
+def fetch_links(server, body: bytes, content_type: str = "text/html") -> str:
+    fetch_page_links = getattr(server.fetch_page_links, "fn", server.fetch_page_links)
+    return serve(server, html_response(body, content_type), lambda m: fetch_page_links(URL))
+
+
+@pytest.fixture(autouse=True)
+def allow_test_url(server, monkeypatch):
+    monkeypatch.setattr(server, "is_safe_url", lambda url: True)
+
+
+def test_links_are_filtered(server):
+    body = b'<a href="http://a">1</a><a href="mailto:x">2</a><a href="/r">3</a><a href="">4</a><a>5</a><a href="https://b">6</a><a href="rel">7</a>'
+    assert fetch_links(server, body).endswith("\n\n- http://a\n- /r\n- https://b")
+
+
+def test_header_charset_is_used_for_hrefs(server):
+    body = '<html><body><a href="/wiki/Café">Café</a><a href="https://bücher.example/ü">x</a></body></html>'.encode("utf-8")
+    result = fetch_links(server, body, "text/html; charset=utf-8")
+    assert "- /wiki/Café\n- https://bücher.example/ü" in result
+
+
+@pytest.mark.parametrize("content_type", ["text/html", "text/html; charset=none"])
+def test_undeclared_charset_is_sniffed_or_utf8(server, content_type):
+    assert "- /wiki/Café" in fetch_links(server, '<a href="/wiki/Café">x</a>'.encode("utf-8"), content_type)
+    body = '<meta charset="windows-1252"><a href="/wiki/Café">x</a>'.encode("cp1252")
+    assert "- /wiki/Café" in fetch_links(server, body, content_type)
+
+
+def test_links_are_truncated(server):
+    body = b"<html><body>" + b"".join(b'<a href="/l%d">x</a>' % i for i in range(150)) + b"</body></html>"
+    result = fetch_links(server, body)
+    assert f"({server.MAX_PAGE_LINKS}+ total" in result
+    assert result.count("\n- ") == server.MAX_PAGE_LINKS
+
+
+def test_leading_comment_before_html(server):
+    body = b'<!-- generated --><html><body><a href="/a">a</a><a href="/b">b</a></body></html>'
+    assert fetch_links(server, body).endswith("\n\n- /a\n- /b")
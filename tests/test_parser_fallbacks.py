@@ -0,0 +1,51 @@
+import pytest
+
+from conftest import SERVER_MODULES, html_response, import_without, serve
+
+URL = "http://93.184.216.34/page"
+
+PARSER_SETUPS = {
+    "selectolax": ("lxml", "lxml.etree"),
+    "html.parser": ("lxml", "lxml.etree", "selectolax", "selectolax.lexbor"),
+}
+
+
+@pytest.fixture(params=[(name, setup) for name in SERVER_MODULES for setup in PARSER_SETUPS],
+                ids=lambda param: f"{param[0]}-{param[1]}")
+def fallback_server(request, monkeypatch):
+    """A server module imported without lxml (and, for html.parser, without selectolax)."""
+    name, setup = request.param
+    module = import_without(monkeypatch, name, PARSER_SETUPS[setup])
+    monkeypatch.setattr(module, "is_safe_url", lambda url: True)
+    assert module.HTMLPullParser is None
+    assert (module.LexborHTMLParser is not None) == (setup == "selectolax")
+    assert module.HTML_PARSER == setup
+    return module
+
+
+def test_visible_text(fallback_server):
+    body = '<!-- c --><html><head><style>p{}</style></head><body><h1>Héllo</h1><p>a<b>bold</b> tail</p><script>x=1</script>end</body></html>'.encode("utf-8")
+    text = serve(fallback_server, html_response(body, "text/html; charset=utf-8"),
+                 lambda m: m.fetch_url_content(URL))
+    assert text == "Héllo\na\nbold\ntail\nend"
+
+
+def test_meta_charset(fallback_server):
+    body = '<meta charset="iso-8859-1"><p>café</p>'.encode("latin-1")
+    assert serve(fallback_server, html_response(body), lambda m: m.fetch_url_content(URL)) == "café"
+
+
+@pytest.mark.parametrize("head, encoding, content_type", [
+    ("", "utf-8", "text/html; charset=utf-8"),
+    ("", "iso-8859-1", "text/html; charset=iso-8859-1"),
+    ('<meta charset="windows-1252">', "cp1252", "text/html"),
+], ids=["utf-8", "header-charset", "meta-charset"])
+def test_page_links(fallback_server, head, encoding, content_type):
+    fetch_page_links = getattr(fallback_server.fetch_page_links, "fn", fallback_server.fetch_page_links)
+    body = (head + '<a href="http://a">1</a><a href="mailto:x">2</a><a href="/wiki/Café">3</a><a href="rel">4</a>').encode(encoding)
+    result = serve(fallback_server, html_response(body, content_type), lambda m: fetch_page_links(URL))
+    assert result.endswith("\n\n- http://a\n- /wiki/Café")
+
+
+def test_lxml_is_reported(server):
+    assert server.HTML_PARSER == "lxml (streaming)"
@@ -0,0 +1,48 @@
+import ipaddress
+import random
+
+import pytest
+
+# IANA special-purpose IPv4 registry, kept independent of the table under test so a missing range is caught
+SPECIAL_NETWORKS = (
+    "0.0.0.0/8", "10.0.0.0/8", "100.64.0.0/10", "127.0.0.0/8", "169.254.0.0/16", "172.16.0.0/12",
+    "192.0.0.0/24", "192.0.2.0/24", "192.31.196.0/24", "192.52.193.0/24", "192.88.99.0/24",
+    "192.168.0.0/16", "192.175.48.0/24", "198.18.0.0/15", "198.51.100.0/24", "203.0.113.0/24",
+    "224.0.0.0/4", "240.0.0.0/4", "255.255.255.255/32",
+)
+
+def ipaddress_verdict(value: int) -> bool:
+    """The classification is_safe_hostname made before the range table: any of the three ipaddress flags."""
+    address = ipaddress.IPv4Address(value)
+    return address.is_private or address.is_loopback or address.is_link_local
+
+
+def sample_addresses(server):
+    """Every range edge and its neighbours, all of 192.0.0.0/24, special cases and seeded random addresses."""
+    values = set(range(0xC0000000, 0xC0000100))
+    networks = map(ipaddress.IPv4Network, SPECIAL_NETWORKS)
+    reference_bounds = [int(bound) for network in networks for bound in (network.network_address, network.broadcast_address)]
+    for bound in server.BLOCKED_IPV4_STARTS + server.BLOCKED_IPV4_ENDS + tuple(reference_bounds):
+        values.update({bound - 1, bound, bound + 1})
+    for address in ("0.0.0.0", "255.255.255.255", "100.64.0.1", "8.8.8.8", "224.0.0.1", "169.254.169.254"):
+        values.add(int(ipaddress.IPv4Address(address)))
+    rng = random.Random(17)
+    values.update(rng.getrandbits(32) for _ in range(20000))
+    return sorted(value for value in values if 0 <= value <= 0xFFFFFFFF)
+
+
+def test_range_table_matches_ipaddress(server):
+    mismatches = [
+        str(ipaddress.IPv4Address(value)) for value in sample_addresses(server)
+        if server.is_blocked_ipv4(str(ipaddress.IPv4Address(value))) != ipaddress_verdict(value)
+    ]
+    assert mismatches == []
+
+
+@pytest.mark.parametrize("address, safe", [
+    ("127.0.0.1", False), ("10.1.2.3", False), ("169.254.169.254", False), ("172.31.255.255", False),
+    ("192.168.1.1", False), ("0.0.0.0", False), ("192.0.0.9", True), ("172.32.0.0", True), ("93.184.216.34", True),
+])
+def test_ip_literal_hostnames(server, monkeypatch, address, safe):
+    monkeypatch.setattr(server, "hostname_cache", {})
+    assert server.is_safe_hostname(address) is safe
@@ -0,0 +1,78 @@
+import pytest
+
+from conftest import html_response, serve
+
+URL = "http://93.184.216.34/page"
+
+
+def fetch_text(server, body: bytes, content_type: str = "text/html") -> str:
+    return serve(server, html_response(body, content_type), lambda m: m.fetch_url_content(URL, safe=True))
+
+
+def collect(server, body: bytes, chunk_size: int = 65536) -> str:
+    collector = server.VisibleTextCollector()
+    for start in range(0, len(body), chunk_size):
+        collector.feed(body[start:start + chunk_size])
+    return collector.close()
+
+
+def test_visible_text_skips_script_and_style(server):
+    body = b"<html><head><style>p{}</style></head><body><h1>Title</h1><p>a<!--c-->b<b>bold</b> tail</p><script>x=1</script>end</body></html>"
+    assert fetch_text(server, body) == "Title\na\nb\nbold\ntail\nend"
+
+
+def test_leading_comment_before_html(server):
+    body = b"<!DOCTYPE html>\n<!-- Generated by WordPress -->\n<html><head><title>Blog</title></head><body><p>Hello</p></body></html>"
+    assert collect(server, body) == "Blog\nHello"
+    assert fetch_text(server, body) == "Blog\nHello"
+
+
+def test_leading_conditional_comment_and_processing_instruction(server):
+    body = b'<?xml version="1.0"?><!--[if IE]><p>old</p><![endif]--><html><body><p>Hello</p></body></html>'
+    assert collect(server, body, chunk_size=7) == "Hello"
+
+
+def test_small_chunks_match_whole_body(server):
+    body = b"<html><body>" + b"".join(b"<div><p>para %d</p><a href='/x'>link</a></div>" % i for i in range(50)) + b"</body></html>"
+    assert collect(server, body, chunk_size=5) == collect(server, body)
+
+
+@pytest.mark.parametrize("charset, codec, text", [
+    ("ks_c_5601-1987", "euc_kr", "안녕"),
+    ("windows-31j", "cp932", "こんにちは"),
+    ("x-sjis", "shift_jis", "こんにちは"),
+    ("utf_8", "utf-8", "Café"),
+    ("ISO-8859-1", "latin-1", "Café"),
+])
+def test_declared_charset_aliases(server, charset, codec, text):
+    body = f"<html><body><p>{text}</p></body></html>".encode(codec)
+    assert fetch_text(server, body, f"text/html; charset={charset}") == text
+
+
+@pytest.mark.parametrize("charset", ["none", "x-user-defined", "bogus"])
+def test_unknown_charset_falls_back_to_meta_then_utf8(server, charset):
+    body = "<p>Café</p>".encode("utf-8")
+    assert fetch_text(server, body, f"text/html; charset={charset}") == "Café"
+    body = '<meta charset="windows-1252"><p>Café</p>'.encode("cp1252")
+    assert fetch_text(server, body, f"text/html; charset={charset}") == "Café"
+
+
+def test_meta_charset_without_header(server):
+    body = '<html><head><meta charset="iso-8859-1"><title>Tést</title></head><body>naïve</body></html>'.encode("latin-1")
+    assert fetch_text(server, body) == "Tést\nnaïve"
+
+
+def test_undeclared_charset_defaults_to_utf8(server):
+    assert fetch_text(server, "<p>Small page ü</p>".encode("utf-8")) == "Small page ü"
+
+
+@pytest.mark.parametrize("codec", ["utf-16", "utf-8-sig"])
+def test_byte_order_mark_wins(server, codec):
+    body = "<html><body><p>Grüße</p></body></html>".encode(codec)
+    assert fetch_text(server, body) == "Grüße"
+    assert fetch_text(server, body, "text/html; charset=iso-8859-1") == "Grüße"
+
+
+def test_multibyte_characters_split_across_chunks(server):
+    body = "<p>안녕하세요</p>".encode("utf-8")
+    assert collect(server, body, chunk_size=1) == "안녕하세요"